@@ -1,3 +1,5 @@
+from typing import Optional
+
 from discount_calculator import DiscountCalculator
 from purchase_validator import PurchaseValidator
 
@@ -5,9 +7,11 @@ from purchase_validator import PurchaseValidator
 class PurchaseProcessor:
     """Procesa compras de principio a fin"""
 
-    def __init__(self):
-        self.calculator = DiscountCalculator()
-        self.validator = PurchaseValidator()
+    def __init__(self, calculator: Optional[DiscountCalculator] = None,
+                 validator: Optional[PurchaseValidator] = None):
+        # Permite compartir calculator/validator entre varios procesadores
+        self.calculator = calculator if calculator is not None else DiscountCalculator()
+        self.validator = validator if validator is not None else PurchaseValidator()
         self.processed_purchases = []
 
     def process_purchase(self, amount: float, customer_age: int, customer_name: str) -> dict:
@@ -54,6 +58,20 @@ class PurchaseProcessor:
 
         return purchase_record
 
+    def process_batch(self, purchases) -> list:
+        """
+        Procesa varias compras en orden
+
+        Recibe tuplas (amount, customer_age, customer_name) y aplica a cada
+        una el mismo flujo que process_purchase.
+
+        Returns:
+            lista de dicts, uno por compra, en el mismo orden de entrada
+        """
+        process = self.process_purchase
+        return [process(amount, customer_age, customer_name)
+                for amount, customer_age, customer_name in purchases]
+
     def get_total_sales(self) -> float:
         """Retorna el total de ventas procesadas"""
         return sum(p['final_amount'] for p in self.processed_purchases if p['success'])
@@ -0,0 +1,349 @@
+import argparse
+import asyncio
+import json
+import math
+import struct
+import time
+from collections import deque
+from typing import Optional
+
+from purchase_processor import PurchaseProcessor
+
+# Cada mensaje es un entero de 4 bytes (big-endian) con el largo + JSON UTF-8
+HEADER = struct.Struct('>I')
+MAX_FRAME_SIZE = 1024 * 1024
+
+# Marca de fin de conexión; no puede confundirse con ningún valor JSON
+CLOSED = object()
+
+
+def encode_frame(payload) -> bytes:
+    """Serializa un mensaje con su prefijo de longitud"""
+    body = json.dumps(payload, separators=(',', ':')).encode('utf-8')
+    return HEADER.pack(len(body)) + body
+
+
+async def read_frame_body(reader: asyncio.StreamReader):
+    """
+    Lee el cuerpo crudo de un mensaje completo del stream
+
+    Returns:
+        los bytes del cuerpo, o CLOSED si la conexión se cerró
+    """
+    try:
+        header = await reader.readexactly(HEADER.size)
+    except asyncio.IncompleteReadError:
+        return CLOSED
+
+    (length,) = HEADER.unpack(header)
+    if length > MAX_FRAME_SIZE:
+        raise ValueError("El mensaje excede el tamaño máximo permitido")
+
+    try:
+        return await reader.readexactly(length)
+    except asyncio.IncompleteReadError:
+        return CLOSED
+
+
+async def read_frame(reader: asyncio.StreamReader):
+    """
+    Lee un mensaje completo del stream
+
+    Returns:
+        el JSON decodificado, o CLOSED si la conexión se cerró
+    """
+    body = await read_frame_body(reader)
+    if body is CLOSED:
+        return CLOSED
+    return json.loads(body)
+
+
+class PurchaseServer:
+    """
+    Servidor TCP local que expone un PurchaseProcessor
+
+    Protocolo:
+    - Cada solicitud es un mensaje con prefijo de longitud
+    - Un objeto {'amount', 'customer_age', 'customer_name'} procesa una compra
+    - Una lista de esos objetos se procesa con process_batch
+    - La conexión se mantiene abierta (keep-alive) y admite pipelining:
+      las respuestas se envían en el mismo orden que las solicitudes
+
+    Todas las conexiones comparten el mismo processor, cuyo historial
+    (processed_purchases) crece con cada compra exitosa y nunca se recorta.
+    """
+
+    def __init__(self, processor: Optional[PurchaseProcessor] = None, host: str = '127.0.0.1', port: int = 0):
+        self.processor = processor if processor is not None else PurchaseProcessor()
+        self.host = host
+        self.port = port
+        self._server = None
+
+    async def start(self):
+        """Inicia el servidor; con port=0 se asigna un puerto libre"""
+        self._server = await asyncio.start_server(self._handle_connection, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def close(self):
+        """Detiene el servidor"""
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    async def serve_forever(self):
+        """Inicia el servidor y atiende conexiones hasta ser cancelado"""
+        if self._server is None:
+            await self.start()
+        async with self._server:
+            await self._server.serve_forever()
+
+    def handle_request(self, request):
+        """
+        Procesa una solicitud ya decodificada
+
+        Un lote se valida completo antes de procesar cualquier compra; si
+        algún elemento es inválido se rechaza el lote entero.
+
+        Returns:
+            dict para una compra individual, lista de dicts para un lote
+        """
+        if isinstance(request, list):
+            try:
+                purchases = [_purchase_args(item) for item in request]
+            except (KeyError, TypeError):
+                return _invalid_request()
+            return self.processor.process_batch(purchases)
+
+        try:
+            amount, customer_age, customer_name = _purchase_args(request)
+        except (KeyError, TypeError):
+            return _invalid_request()
+        return self.processor.process_purchase(amount, customer_age, customer_name)
+
+    async def _handle_connection(self, reader, writer):
+        try:
+            while True:
+                try:
+                    body = await read_frame_body(reader)
+                except ValueError:
+                    # Mensaje demasiado grande: no se puede resincronizar
+                    writer.write(encode_frame(_invalid_request()))
+                    break
+
+                if body is CLOSED:
+                    break
+
+                # El mensaje ya se leyó completo, así que un JSON inválido
+                # se rechaza sin cerrar la conexión
+                try:
+                    response = self.handle_request(json.loads(body))
+                except (ValueError, RecursionError):
+                    # JSON inválido o anidado demasiado profundo
+                    response = _invalid_request()
+
+                # drain() solo bloquea si el buffer de salida supera su límite,
+                # así las solicitudes en pipeline se responden sin esperas
+                writer.write(encode_frame(response))
+                await writer.drain()
+            await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+
+def _is_number(value) -> bool:
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        return False
+    try:
+        return math.isfinite(value)
+    except OverflowError:
+        # Enteros JSON demasiado grandes para convertirse a float
+        return False
+
+
+def _purchase_args(item: dict) -> tuple:
+    if not isinstance(item, dict):
+        raise TypeError("La compra debe ser un objeto")
+
+    amount, customer_age, customer_name = item['amount'], item['customer_age'], item['customer_name']
+    if not (_is_number(amount) and _is_number(customer_age) and isinstance(customer_name, str)):
+        raise TypeError("Tipos de datos inválidos en la compra")
+    return amount, customer_age, customer_name
+
+
+def _invalid_request() -> dict:
+    return {
+        'success': False,
+        'message': 'Solicitud inválida',
+        'original_amount': 0,
+        'final_amount': 0,
+        'discount_percent': 0
+    }
+
+
+# CLIENTE GENERADOR DE CARGA
+def _percentile(sorted_values: list, percent: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(percent / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def _is_error_response(response) -> bool:
+    if isinstance(response, dict):
+        return response.get('success') is not True
+    if isinstance(response, list):
+        return not response or any(_is_error_response(item) for item in response)
+    return True
+
+
+async def _drive_connection(host, port, payloads, pipeline_depth, latencies) -> int:
+    """Envía los payloads por una conexión y retorna el número de errores"""
+    reader, writer = await asyncio.open_connection(host, port)
+    in_flight = deque()
+    successes = 0
+
+    async def receive() -> bool:
+        nonlocal successes
+        try:
+            response = await read_frame(reader)
+        except (ValueError, RecursionError):
+            response = None
+        sent_at = in_flight.popleft()
+        if response is CLOSED:
+            return False
+        if not _is_error_response(response):
+            successes += 1
+            latencies.append(time.perf_counter() - sent_at)
+        return True
+
+    try:
+        for payload in payloads:
+            if len(in_flight) >= pipeline_depth and not await receive():
+                break
+            writer.write(encode_frame(payload))
+            in_flight.append(time.perf_counter())
+            await writer.drain()
+        else:
+            while in_flight and await receive():
+                pass
+    except ConnectionError:
+        pass
+    finally:
+        writer.close()
+        try:
+            await writer.wait_closed()
+        except ConnectionError:
+            pass
+
+    # Todo lo que no obtuvo una respuesta exitosa cuenta como error
+    return len(payloads) - successes
+
+
+async def run_load(host: str, port: int, connections: int = 4, requests_per_connection: int = 1000,
+                   batch_size: int = 1, pipeline_depth: int = 16) -> dict:
+    """
+    Genera carga contra un PurchaseServer y mide latencia y throughput
+
+    Cada conexión envía requests_per_connection solicitudes manteniendo
+    hasta pipeline_depth solicitudes en vuelo. Con batch_size > 1 cada
+    solicitud es un lote de compras.
+
+    Una respuesta ausente (conexión cerrada) o con success=False cuenta
+    como error y no entra en las métricas de latencia ni de throughput.
+
+    Returns:
+        dict con el reporte de latencia (ms), throughput y errores
+    """
+    if connections < 1 or requests_per_connection < 1 or batch_size < 1 or pipeline_depth < 1:
+        raise ValueError("Los parámetros de carga deben ser mayores a cero")
+
+    purchase = {'amount': 750, 'customer_age': 30, 'customer_name': 'Cliente Carga'}
+    payload = purchase if batch_size == 1 else [purchase] * batch_size
+    payloads = [payload] * requests_per_connection
+
+    latencies = []
+    start = time.perf_counter()
+    errors = await asyncio.gather(*(
+        _drive_connection(host, port, payloads, pipeline_depth, latencies)
+        for _ in range(connections)
+    ))
+    elapsed = time.perf_counter() - start
+
+    # Throughput y latencia solo consideran respuestas exitosas
+    total_requests = connections * requests_per_connection
+    total_errors = sum(errors)
+    successful = total_requests - total_errors
+    latencies.sort()
+    return {
+        'connections': connections,
+        'requests': total_requests,
+        'errors': total_errors,
+        'purchases': successful * batch_size,
+        'batch_size': batch_size,
+        'pipeline_depth': pipeline_depth,
+        'elapsed_seconds': round(elapsed, 4),
+        'requests_per_second': round(successful / elapsed, 2),
+        'purchases_per_second': round(successful * batch_size / elapsed, 2),
+        'latency_ms': {
+            'p50': round(_percentile(latencies, 50) * 1000, 3),
+            'p95': round(_percentile(latencies, 95) * 1000, 3),
+            'p99': round(_percentile(latencies, 99) * 1000, 3),
+            'max': round(latencies[-1] * 1000, 3) if latencies else 0.0,
+        }
+    }
+
+
+async def run_local_benchmark(**load_options) -> dict:
+    """Levanta un servidor en localhost, ejecuta run_load contra él y lo detiene"""
+    server = PurchaseServer()
+    await server.start()
+    try:
+        return await run_load(server.host, server.port, **load_options)
+    finally:
+        await server.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Servidor local de procesamiento de compras")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    serve = subparsers.add_parser('serve', help="Inicia el servidor")
+    serve.add_argument('--host', default='127.0.0.1')
+    serve.add_argument('--port', type=int, default=8765)
+
+    bench = subparsers.add_parser('bench', help="Reporte de latencia/throughput en localhost")
+    bench.add_argument('--host', default=None, help="Servidor existente; si se omite se levanta uno local")
+    bench.add_argument('--port', type=int, default=8765)
+    bench.add_argument('--connections', type=int, default=4)
+    bench.add_argument('--requests', type=int, default=1000)
+    bench.add_argument('--batch-size', type=int, default=1)
+    bench.add_argument('--pipeline-depth', type=int, default=16)
+
+    args = parser.parse_args(argv)
+
+    if args.command == 'serve':
+        server = PurchaseServer(host=args.host, port=args.port)
+        try:
+            asyncio.run(server.serve_forever())
+        except KeyboardInterrupt:
+            pass
+        return
+
+    load_options = {
+        'connections': args.connections,
+        'requests_per_connection': args.requests,
+        'batch_size': args.batch_size,
+        'pipeline_depth': args.pipeline_depth,
+    }
+    if args.host is None:
+        report = asyncio.run(run_local_benchmark(**load_options))
+    else:
+        report = asyncio.run(run_load(args.host, args.port, **load_options))
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == '__main__':
+    main()
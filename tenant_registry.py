@@ -0,0 +1,223 @@
+import argparse
+import json
+import math
+import time
+import tracemalloc
+
+from discount_calculator import DiscountCalculator
+from purchase_processor import PurchaseProcessor
+from purchase_validator import PurchaseValidator
+
+
+class _Frozen:
+    """Impide asignar o borrar atributos después de creado el objeto"""
+
+    def __setattr__(self, name, value):
+        raise AttributeError("La configuración compartida es inmutable")
+
+    def __delattr__(self, name):
+        raise AttributeError("La configuración compartida es inmutable")
+
+
+class _SharedValidator(_Frozen, PurchaseValidator):
+    """PurchaseValidator de solo lectura, compartido entre tiendas"""
+
+    def __init__(self, max_amount: float):
+        object.__setattr__(self, 'max_amount', max_amount)
+
+
+class _SharedCalculator(_Frozen, DiscountCalculator):
+    """DiscountCalculator de solo lectura, compartido entre tiendas"""
+
+
+class TenantRegistry:
+    """
+    Registro de tiendas (tenants) con configuraciones compartidas
+
+    Cada conjunto de reglas distinto (hoy solo max_amount) tiene un único
+    validador inmutable compartido por todas las tiendas que lo usan, y
+    todas comparten el mismo calculador inmutable. Cada tienda conserva su
+    propio PurchaseProcessor, así el historial y los totales quedan aislados.
+    """
+
+    def __init__(self):
+        self.calculator = _SharedCalculator()
+        self._validators = {}
+        self._tenants = {}
+
+    def register_tenant(self, tenant_id, max_amount: float = 10000) -> PurchaseProcessor:
+        """
+        Registra una tienda con sus reglas
+
+        Returns:
+            el PurchaseProcessor propio de la tienda
+        """
+        if tenant_id in self._tenants:
+            raise ValueError(f"La tienda {tenant_id} ya está registrada")
+
+        max_amount = _normalize_max_amount(max_amount)
+        validator = self._validators.get(max_amount)
+        if validator is None:
+            validator = self._validators[max_amount] = _SharedValidator(max_amount)
+
+        processor = PurchaseProcessor(calculator=self.calculator, validator=validator)
+        self._tenants[tenant_id] = processor
+        return processor
+
+    def get_processor(self, tenant_id) -> PurchaseProcessor:
+        """Retorna el procesador de la tienda"""
+        try:
+            return self._tenants[tenant_id]
+        except KeyError:
+            raise KeyError(f"La tienda {tenant_id} no está registrada") from None
+
+    def process_purchase(self, tenant_id, amount: float, customer_age: int, customer_name: str) -> dict:
+        """Procesa una compra con las reglas y el historial de la tienda"""
+        return self.get_processor(tenant_id).process_purchase(amount, customer_age, customer_name)
+
+    def process_batch(self, purchases) -> list:
+        """
+        Procesa compras de varias tiendas en una sola llamada
+
+        Recibe tuplas (tenant_id, amount, customer_age, customer_name).
+        Todo el lote se valida (forma, tipos y tiendas) antes de procesar,
+        así un elemento inválido rechaza el lote sin modificar ningún
+        historial.
+
+        Returns:
+            lista de dicts, uno por compra, en el mismo orden de entrada
+        """
+        checked = [self._batch_args(purchase) for purchase in purchases]
+        return [processor.process_purchase(amount, customer_age, customer_name)
+                for processor, amount, customer_age, customer_name in checked]
+
+    def _batch_args(self, purchase) -> tuple:
+        try:
+            tenant_id, amount, customer_age, customer_name = purchase
+        except (TypeError, ValueError):
+            raise ValueError("Cada compra del lote debe ser "
+                             "(tenant_id, amount, customer_age, customer_name)") from None
+
+        if not (_is_number(amount) and _is_number(customer_age) and isinstance(customer_name, str)):
+            raise TypeError("Tipos de datos inválidos en la compra del lote")
+        return self.get_processor(tenant_id), amount, customer_age, customer_name
+
+    def get_total_sales(self, tenant_id) -> float:
+        """Retorna el total de ventas de la tienda"""
+        return self.get_processor(tenant_id).get_total_sales()
+
+    def get_purchase_count(self, tenant_id) -> int:
+        """Retorna el número de compras exitosas de la tienda"""
+        return self.get_processor(tenant_id).get_purchase_count()
+
+    def get_tenant_count(self) -> int:
+        """Retorna el número de tiendas registradas"""
+        return len(self._tenants)
+
+    def get_config_count(self) -> int:
+        """Retorna el número de configuraciones distintas compartidas"""
+        return len(self._validators)
+
+
+def _is_number(value) -> bool:
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        return False
+    try:
+        return math.isfinite(value)
+    except OverflowError:
+        return False
+
+
+def _normalize_max_amount(max_amount) -> float:
+    """Valida el monto máximo y unifica valores equivalentes (5000 y 5000.0)"""
+    if isinstance(max_amount, bool) or not isinstance(max_amount, (int, float)):
+        raise ValueError("El monto máximo debe ser un número")
+    try:
+        value = float(max_amount)
+    except OverflowError:
+        raise ValueError("El monto máximo es demasiado grande") from None
+    if not math.isfinite(value) or value <= 0:
+        raise ValueError("El monto máximo debe ser mayor a cero")
+    if value.is_integer():
+        return int(value)
+    return value
+
+
+# REPORTE DE MEMORIA Y COSTO DE BÚSQUEDA
+def _allocated_bytes(build) -> int:
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        result = build()
+        after = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    del result
+    return after - before
+
+
+def _build_registry(tenant_count: int, distinct_configs: int) -> TenantRegistry:
+    registry = TenantRegistry()
+    for tenant_id in range(tenant_count):
+        registry.register_tenant(tenant_id, max_amount=1000 * (tenant_id % distinct_configs + 1))
+    return registry
+
+
+def _build_unshared(tenant_count: int, distinct_configs: int) -> dict:
+    processors = {}
+    for tenant_id in range(tenant_count):
+        validator = PurchaseValidator(max_amount=1000 * (tenant_id % distinct_configs + 1))
+        processors[tenant_id] = PurchaseProcessor(validator=validator)
+    return processors
+
+
+def measure_registry(tenant_counts=(1000, 10000, 100000), distinct_configs: int = 10,
+                     lookups: int = 100000) -> list:
+    """
+    Mide memoria y costo de búsqueda del registro según el número de tiendas
+
+    Compara contra construir un PurchaseProcessor independiente por tienda.
+
+    Returns:
+        lista de dicts, uno por cada valor de tenant_counts
+    """
+    if distinct_configs < 1 or lookups < 1:
+        raise ValueError("Los parámetros deben ser mayores a cero")
+
+    report = []
+    for tenant_count in tenant_counts:
+        if tenant_count < 1:
+            raise ValueError("El número de tiendas debe ser mayor a cero")
+
+        shared_bytes = _allocated_bytes(lambda: _build_registry(tenant_count, distinct_configs))
+        unshared_bytes = _allocated_bytes(lambda: _build_unshared(tenant_count, distinct_configs))
+
+        registry = _build_registry(tenant_count, distinct_configs)
+        get_processor = registry.get_processor
+        start = time.perf_counter()
+        for i in range(lookups):
+            get_processor(i % tenant_count)
+        lookup_seconds = time.perf_counter() - start
+
+        report.append({
+            'tenants': tenant_count,
+            'configs': registry.get_config_count(),
+            'bytes_per_tenant': round(shared_bytes / tenant_count, 1),
+            'bytes_per_tenant_unshared': round(unshared_bytes / tenant_count, 1),
+            'lookup_ns': round(lookup_seconds / lookups * 1e9, 1),
+        })
+    return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Reporte de memoria y búsqueda del registro de tiendas")
+    parser.add_argument('--tenants', type=int, nargs='+', default=[1000, 10000, 100000])
+    parser.add_argument('--configs', type=int, default=10)
+    parser.add_argument('--lookups', type=int, default=100000)
+    args = parser.parse_args(argv)
+
+    print(json.dumps(measure_registry(args.tenants, args.configs, args.lookups), indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -1,5 +1,9 @@
+import asyncio
+
 import pytest
 from purchase_processor import PurchaseProcessor
+from purchase_server import HEADER, PurchaseServer, encode_frame, read_frame, run_load
+from purchase_validator import PurchaseValidator
 
 # PRUEBAS DEL FLUJO COMPLETO - Los 3 módulos trabajando juntos
 class TestPurchaseProcessorFullFlow:
@@ -234,6 +238,181 @@ class TestRealWorldScenarios:
         # Total de compras del cliente
         assert self.processor.get_purchase_count() == 3
 
+    def test_batch_processing(self):
+        """Procesar un lote de compras en una sola llamada"""
+        results = self.processor.process_batch([
+            (150, 22, "Cliente 1"),
+            (50, 17, "Cliente Menor"),  # Rechazada
+            (2000, 50, "Cliente 2"),
+        ])
+
+        assert [r['success'] for r in results] == [True, False, True]
+        assert results[0]['final_amount'] == 135.0
+        assert results[2]['final_amount'] == 1600.0
+        assert self.processor.get_purchase_count() == 2
+
+# TESTS DEL SERVIDOR LOCAL
+class TestPurchaseServer:
+    """Pruebas del servidor TCP con el flujo completo"""
+
+    def setup_method(self):
+        self.processor = PurchaseProcessor()
+
+    def run_with_server(self, client):
+        """Levanta un servidor en localhost y ejecuta el cliente contra él"""
+        async def scenario():
+            server = PurchaseServer(self.processor)
+            await server.start()
+            try:
+                return await client(server)
+            finally:
+                await server.close()
+        return asyncio.run(scenario())
+
+    def test_pipelined_requests_on_one_connection(self):
+        """Varias solicitudes en pipeline responden en orden por la misma conexión"""
+        async def client(server):
+            reader, writer = await asyncio.open_connection(server.host, server.port)
+            writer.write(encode_frame({'amount': 750, 'customer_age': 30, 'customer_name': 'A'}))
+            writer.write(encode_frame({'amount': 500, 'customer_age': 17, 'customer_name': 'B'}))
+            writer.write(encode_frame([
+                {'amount': 100, 'customer_age': 25, 'customer_name': 'C'},
+                {'amount': 1000, 'customer_age': 40, 'customer_name': 'D'},
+            ]))
+            await writer.drain()
+            responses = [await read_frame(reader) for _ in range(3)]
+            writer.close()
+            await writer.wait_closed()
+            return responses
+
+        first, second, batch = self.run_with_server(client)
+
+        assert first['success'] is True
+        assert first['final_amount'] == 637.5
+        assert second['success'] is False
+        assert 'mayor de edad' in second['message']
+        assert [r['final_amount'] for r in batch] == [90.0, 800.0]
+        assert self.processor.get_purchase_count() == 3
+
+    def test_invalid_request(self):
+        """Una solicitud sin los campos requeridos se rechaza sin cerrar la conexión"""
+        async def client(server):
+            reader, writer = await asyncio.open_connection(server.host, server.port)
+            writer.write(encode_frame({'amount': 100}))
+            writer.write(encode_frame({'amount': 100, 'customer_age': 25, 'customer_name': 'E'}))
+            await writer.drain()
+            responses = [await read_frame(reader) for _ in range(2)]
+            writer.close()
+            await writer.wait_closed()
+            return responses
+
+        invalid, valid = self.run_with_server(client)
+
+        assert invalid['success'] is False
+        assert 'inválida' in invalid['message']
+        assert valid['success'] is True
+
+    def send_and_receive(self, frames):
+        """Envía mensajes en pipeline por una conexión y lee una respuesta por cada uno"""
+        async def client(server):
+            reader, writer = await asyncio.open_connection(server.host, server.port)
+            for frame in frames:
+                writer.write(frame)
+            await writer.drain()
+            responses = [await read_frame(reader) for _ in frames]
+            writer.close()
+            await writer.wait_closed()
+            return responses
+        return self.run_with_server(client)
+
+    @pytest.mark.parametrize("bad_purchase", [
+        {'amount': "100", 'customer_age': 25, 'customer_name': 'X'},
+        {'amount': None, 'customer_age': 25, 'customer_name': 'X'},
+        {'amount': True, 'customer_age': 25, 'customer_name': 'X'},
+        {'amount': 100, 'customer_age': "25", 'customer_name': 'X'},
+        {'amount': 100, 'customer_age': 25, 'customer_name': 7},
+        {'amount': 10 ** 400, 'customer_age': 30, 'customer_name': 'X'},
+    ])
+    def test_invalid_types_keep_connection_open(self, bad_purchase):
+        """Tipos inválidos se rechazan y las solicitudes siguientes se siguen atendiendo"""
+        invalid, valid = self.send_and_receive([
+            encode_frame(bad_purchase),
+            encode_frame({'amount': 100, 'customer_age': 25, 'customer_name': 'Y'}),
+        ])
+
+        assert invalid['success'] is False
+        assert 'inválida' in invalid['message']
+        assert valid['success'] is True
+        assert self.processor.get_purchase_count() == 1
+
+    def test_invalid_batch_item_rejects_whole_batch(self):
+        """Un elemento inválido rechaza el lote sin registrar compras parciales"""
+        invalid, valid = self.send_and_receive([
+            encode_frame([
+                {'amount': 100, 'customer_age': 25, 'customer_name': 'A'},
+                {'amount': "100", 'customer_age': 25, 'customer_name': 'B'},
+            ]),
+            encode_frame({'amount': 100, 'customer_age': 25, 'customer_name': 'C'}),
+        ])
+
+        assert invalid['success'] is False
+        assert valid['success'] is True
+        assert self.processor.get_purchase_count() == 1
+        assert self.processor.processed_purchases[0]['customer_name'] == 'C'
+
+    def test_null_and_malformed_json_get_a_reply(self):
+        """Un JSON null o mal formado recibe respuesta sin cerrar la conexión"""
+        malformed = b'{no es json'
+        null, bad_json, valid = self.send_and_receive([
+            encode_frame(None),
+            HEADER.pack(len(malformed)) + malformed,
+            encode_frame({'amount': 100, 'customer_age': 25, 'customer_name': 'Z'}),
+        ])
+
+        assert null['success'] is False
+        assert bad_json['success'] is False
+        assert valid['success'] is True
+
+    def test_deeply_nested_json_gets_a_reply(self):
+        """Un JSON anidado demasiado profundo se rechaza sin cerrar la conexión"""
+        nested = b'[' * 100000
+        invalid, valid = self.send_and_receive([
+            HEADER.pack(len(nested)) + nested,
+            encode_frame({'amount': 100, 'customer_age': 25, 'customer_name': 'Z'}),
+        ])
+
+        assert invalid['success'] is False
+        assert valid['success'] is True
+
+    def test_load_report_counts_errors(self):
+        """Las respuestas con success=False se reportan como errores"""
+        self.processor.validator = PurchaseValidator(max_amount=100)
+
+        async def client(server):
+            return await run_load(server.host, server.port, connections=2,
+                                  requests_per_connection=10, pipeline_depth=4)
+
+        report = self.run_with_server(client)
+
+        assert report['errors'] == 20
+        assert report['purchases'] == 0
+        assert report['requests_per_second'] == 0
+
+    def test_load_report(self):
+        """El generador de carga reporta latencia y throughput"""
+        async def client(server):
+            return await run_load(server.host, server.port, connections=2,
+                                  requests_per_connection=20, batch_size=5, pipeline_depth=4)
+
+        report = self.run_with_server(client)
+
+        assert report['requests'] == 40
+        assert report['errors'] == 0
+        assert report['purchases'] == 200
+        assert report['purchases_per_second'] > 0
+        assert report['latency_ms']['p50'] <= report['latency_ms']['max']
+        assert self.processor.get_purchase_count() == 200
+
 # FIXTURES DE PYTEST
 @pytest.fixture
 def processor():
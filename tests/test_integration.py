@@ -1,6 +1,7 @@
 import pytest
 from discount_calculator import DiscountCalculator
 from purchase_validator import PurchaseValidator
+from tenant_registry import TenantRegistry, measure_registry
 
 
 # PRUEBAS DE INTEGRACIÓN - Calculator + Validator
@@ -142,6 +143,145 @@ class TestCalculatorValidatorIntegration:
         final = self.calculator.apply_discount(amount, discount)
         assert final == 99.99
 
+# PRUEBAS DE INTEGRACIÓN - Registro de tiendas
+class TestTenantRegistryIntegration:
+    """Pruebas del registro multi-tienda con configuraciones compartidas"""
+
+    def setup_method(self):
+        self.registry = TenantRegistry()
+        self.registry.register_tenant('tienda-a', max_amount=5000)
+        self.registry.register_tenant('tienda-b', max_amount=5000)
+        self.registry.register_tenant('tienda-c', max_amount=20000)
+
+    def test_shared_configs_are_deduplicated(self):
+        """Tiendas con las mismas reglas comparten validator y calculator"""
+        a = self.registry.get_processor('tienda-a')
+        b = self.registry.get_processor('tienda-b')
+        c = self.registry.get_processor('tienda-c')
+
+        assert a.validator is b.validator
+        assert a.validator is not c.validator
+        assert a.calculator is c.calculator
+        assert self.registry.get_config_count() == 2
+        assert self.registry.get_tenant_count() == 3
+
+    def test_tenant_rules_applied(self):
+        """Cada tienda valida con su propio límite"""
+        result_a = self.registry.process_purchase('tienda-a', 8000, 30, "Cliente 1")
+        result_c = self.registry.process_purchase('tienda-c', 8000, 30, "Cliente 1")
+
+        assert result_a['success'] is False
+        assert '5000' in result_a['message']
+        assert result_c['success'] is True
+        assert result_c['final_amount'] == 6400.0
+
+    def test_ledgers_are_isolated(self):
+        """El historial y los totales de cada tienda son independientes"""
+        self.registry.process_purchase('tienda-a', 100, 25, "Cliente 1")
+        self.registry.process_purchase('tienda-a', 500, 25, "Cliente 2")
+        self.registry.process_purchase('tienda-b', 1000, 25, "Cliente 3")
+
+        assert self.registry.get_purchase_count('tienda-a') == 2
+        assert self.registry.get_total_sales('tienda-a') == 90.0 + 425.0
+        assert self.registry.get_purchase_count('tienda-b') == 1
+        assert self.registry.get_total_sales('tienda-b') == 800.0
+        assert self.registry.get_purchase_count('tienda-c') == 0
+
+    def test_batch_across_tenants(self):
+        """Un lote con compras de varias tiendas respeta el orden y las reglas"""
+        results = self.registry.process_batch([
+            ('tienda-a', 600, 30, "Cliente 1"),
+            ('tienda-c', 15000, 30, "Cliente 2"),
+            ('tienda-b', 15000, 30, "Cliente 3"),  # Excede límite de tienda-b
+        ])
+
+        assert [r['success'] for r in results] == [True, True, False]
+        assert results[1]['final_amount'] == 12000.0
+        assert self.registry.get_purchase_count('tienda-a') == 1
+        assert self.registry.get_purchase_count('tienda-b') == 0
+        assert self.registry.get_purchase_count('tienda-c') == 1
+
+    def test_unknown_tenant_raises_error(self):
+        """Procesar para una tienda no registrada debe lanzar error"""
+        with pytest.raises(KeyError, match="no está registrada"):
+            self.registry.process_purchase('tienda-x', 100, 25, "Cliente")
+        with pytest.raises(KeyError, match="no está registrada"):
+            self.registry.process_batch([('tienda-x', 100, 25, "Cliente")])
+
+    def test_shared_config_is_immutable(self):
+        """La configuración compartida no puede modificarse desde una tienda"""
+        processor = self.registry.get_processor('tienda-a')
+        with pytest.raises(AttributeError, match="inmutable"):
+            processor.validator.max_amount = 1
+        with pytest.raises(AttributeError, match="inmutable"):
+            processor.calculator.calculate_discount = lambda amount: 100
+
+        result = self.registry.process_purchase('tienda-b', 100, 25, "Cliente")
+        assert result['success'] is True
+        assert result['discount_percent'] == 10
+
+    def test_standalone_validator_stays_mutable(self):
+        """Fuera del registro, PurchaseValidator sigue siendo modificable"""
+        validator = PurchaseValidator()
+        validator.max_amount = 500
+        assert validator.validate_purchase(600, 25)['valid'] is False
+
+    def test_equivalent_max_amounts_share_config(self):
+        """5000 y 5000.0 son la misma configuración y el mismo mensaje"""
+        self.registry.register_tenant('tienda-d', max_amount=5000.0)
+
+        d = self.registry.get_processor('tienda-d')
+        assert d.validator is self.registry.get_processor('tienda-a').validator
+        assert self.registry.get_config_count() == 2
+        result = self.registry.process_purchase('tienda-d', 6000, 25, "Cliente")
+        assert '($5000)' in result['message']
+
+    @pytest.mark.parametrize("max_amount", ["5000", None, True, 0, -100, float('nan'), 10 ** 400])
+    def test_invalid_max_amount_raises_error(self, max_amount):
+        """Montos máximos no numéricos o no positivos se rechazan al registrar"""
+        with pytest.raises(ValueError, match="monto máximo"):
+            self.registry.register_tenant('tienda-x', max_amount=max_amount)
+        assert self.registry.get_tenant_count() == 3
+
+    def test_batch_with_unknown_tenant_processes_nothing(self):
+        """Una tienda desconocida en el lote no deja compras registradas"""
+        with pytest.raises(KeyError, match="no está registrada"):
+            self.registry.process_batch([
+                ('tienda-a', 100, 25, "Cliente 1"),
+                ('tienda-x', 100, 25, "Cliente 2"),
+            ])
+
+        assert self.registry.get_purchase_count('tienda-a') == 0
+
+    @pytest.mark.parametrize("bad_purchase, error", [
+        (('tienda-a', 100, 30), ValueError),
+        (('tienda-a', '100', 30, "Cliente 2"), TypeError),
+        (('tienda-a', 10 ** 400, 30, "Cliente 2"), TypeError),
+    ])
+    def test_batch_with_malformed_purchase_processes_nothing(self, bad_purchase, error):
+        """Una compra mal formada en el lote no deja compras registradas"""
+        with pytest.raises(error):
+            self.registry.process_batch([
+                ('tienda-a', 100, 30, "Cliente 1"),
+                bad_purchase,
+            ])
+
+        assert self.registry.get_purchase_count('tienda-a') == 0
+
+    def test_duplicate_tenant_raises_error(self):
+        """Registrar dos veces la misma tienda debe lanzar error"""
+        with pytest.raises(ValueError, match="ya está registrada"):
+            self.registry.register_tenant('tienda-a')
+
+    def test_measure_registry_report(self):
+        """El reporte incluye memoria y costo de búsqueda por número de tiendas"""
+        report = measure_registry(tenant_counts=(10, 100), distinct_configs=3, lookups=100)
+
+        assert [row['tenants'] for row in report] == [10, 100]
+        assert all(row['configs'] == 3 for row in report)
+        assert all(row['bytes_per_tenant'] > 0 for row in report)
+        assert all(row['lookup_ns'] > 0 for row in report)
+
 # FIXTURES DE PYTEST
 @pytest.fixture
 def calculator():